@@ -3,33 +3,89 @@
 環境変数やアプリケーション設定を管理
 """
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
-# .envファイルを読み込む
-load_dotenv()
-
 # プロジェクトのルートディレクトリ
 BASE_DIR = Path(__file__).parent
 
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """アプリケーション設定（プロセス内で一度だけ生成）"""
+    # データベース設定
+    database_path: str
+    # スクレイピング設定
+    request_delay: float  # リクエスト間隔（秒）
+    request_timeout: int  # タイムアウト（秒）
+    max_retries: int  # 最大リトライ回数
+    max_concurrency: int  # 同時リクエスト数の上限
+    user_agent: str
+    # HTTPキャッシュ設定
+    http_cache_path: str
+    http_cache_expire: int  # キャッシュの有効期限（秒）
+    # ログ設定
+    log_level: str
+    log_file: Path
+    # ディレクトリ
+    data_dir: Path
+    export_dir: Path
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """.envファイルと環境変数から設定を読み込む"""
+    # .envファイルを読み込む
+    load_dotenv()
+
+    data_dir = BASE_DIR / 'data'
+    return Settings(
+        database_path=os.getenv('DATABASE_PATH', str(data_dir / 'ec_companies.db')),
+        request_delay=float(os.getenv('REQUEST_DELAY', '1.0')),
+        request_timeout=int(os.getenv('REQUEST_TIMEOUT', '30')),
+        max_retries=int(os.getenv('MAX_RETRIES', '3')),
+        max_concurrency=int(os.getenv('MAX_CONCURRENCY', '5')),
+        user_agent=os.getenv('USER_AGENT', DEFAULT_USER_AGENT),
+        http_cache_path=os.getenv('HTTP_CACHE_PATH', str(data_dir / 'http_cache.sqlite')),
+        http_cache_expire=int(os.getenv('HTTP_CACHE_EXPIRE', '3600')),
+        log_level=os.getenv('LOG_LEVEL', 'INFO'),
+        log_file=Path(os.getenv('LOG_FILE', str(BASE_DIR / 'logs' / 'app.log'))),
+        data_dir=data_dir,
+        export_dir=data_dir / 'exports',
+    )
+
+
+SETTINGS = get_settings()
+
 # データベース設定
-DATABASE_PATH = os.getenv('DATABASE_PATH', str(BASE_DIR / 'data' / 'ec_companies.db'))
+DATABASE_PATH = SETTINGS.database_path
 
 # スクレイピング設定
-REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', '1.0'))  # リクエスト間隔（秒）
-REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '30'))  # タイムアウト（秒）
-MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))  # 最大リトライ回数
-USER_AGENT = os.getenv(
-    'USER_AGENT',
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-)
+REQUEST_DELAY = SETTINGS.request_delay
+REQUEST_TIMEOUT = SETTINGS.request_timeout
+MAX_RETRIES = SETTINGS.max_retries
+MAX_CONCURRENCY = SETTINGS.max_concurrency
+USER_AGENT = SETTINGS.user_agent
+
+# HTTPキャッシュ設定
+HTTP_CACHE_PATH = SETTINGS.http_cache_path
+HTTP_CACHE_EXPIRE = SETTINGS.http_cache_expire
 
 # ログ設定
-LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-LOG_FILE = os.getenv('LOG_FILE', str(BASE_DIR / 'logs' / 'app.log'))
+LOG_LEVEL = SETTINGS.log_level
+LOG_FILE = str(SETTINGS.log_file)
+LOG_FILE_PATH = SETTINGS.log_file
+
+# エクスポート先ディレクトリ
+EXPORT_DIR = SETTINGS.export_dir
 
 # ディレクトリの作成
 (BASE_DIR / 'logs').mkdir(exist_ok=True)
-(BASE_DIR / 'data').mkdir(exist_ok=True)
-(BASE_DIR / 'data' / 'exports').mkdir(exist_ok=True)
-
+SETTINGS.data_dir.mkdir(exist_ok=True)
+SETTINGS.export_dir.mkdir(exist_ok=True)
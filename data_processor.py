@@ -3,12 +3,54 @@
 取得したデータを整形・正規化する
 """
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from dataclasses import asdict, fields, is_dataclass
+from typing import Dict, Any, List, Optional, Union
+from datetime import date, datetime
+from itertools import compress
+import numpy as np
+import pandas as pd
 import utils
 
 logger = logging.getLogger(__name__)
 
+# process_companies_batchでプロセスプールを使用する件数の閾値
+PARALLEL_THRESHOLD = 1000
+# プロセスプールで一度にワーカーへ渡す件数
+PARALLEL_CHUNK_SIZE = 256
+
+# 出力データのカラム
+_OUTPUT_COLUMNS = [
+    'company_name', 'address', 'postal_code', 'phone_number', 'website_url', 'source_url',
+    'company_number', 'representative', 'established_date', 'employee_count',
+    'annual_sales', 'product_categories', 'email', 'notes'
+]
+_TEXT_COLUMNS = [
+    'company_name', 'address', 'company_number', 'representative', 'product_categories', 'notes'
+]
+
+
+def _to_date(value: Any) -> Optional[date]:
+    """日付文字列またはdatetimeをdateに変換"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        date_obj = utils.parse_date(value)
+        return date_obj.date() if date_obj else None
+    if isinstance(value, datetime):
+        return value.date()
+    return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """数値または数字を含む文字列を整数に変換"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        return utils.extract_numbers(value)
+    if isinstance(value, (int, float)):
+        return int(value)
+    return None
+
 
 class DataProcessor:
     """データ整形クラス"""
@@ -17,106 +59,210 @@ class DataProcessor:
         """初期化"""
         pass
     
-    def process_company_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    def process_company_data(self, raw_data: Any) -> Dict[str, Any]:
         """
         事業所データを整形
         
         Args:
-            raw_data: 取得した生データ
+            raw_data: 取得した生データ（辞書またはデータクラス）
             
         Returns:
             整形されたデータ
         """
-        processed = {}
-        
-        # 必須項目の処理
-        processed['company_name'] = utils.clean_text(raw_data.get('company_name'))
-        processed['address'] = utils.clean_text(raw_data.get('address'))
-        processed['postal_code'] = utils.normalize_postal_code(raw_data.get('postal_code'))
-        processed['phone_number'] = utils.normalize_phone_number(raw_data.get('phone_number'))
-        processed['website_url'] = utils.normalize_url(raw_data.get('website_url'))
-        processed['source_url'] = raw_data.get('source_url')
-        
-        # 任意項目の処理
-        processed['company_number'] = utils.clean_text(raw_data.get('company_number'))
-        processed['representative'] = utils.clean_text(raw_data.get('representative'))
-        
-        # 日付の処理
-        established_date = raw_data.get('established_date')
-        if established_date:
-            if isinstance(established_date, str):
-                date_obj = utils.parse_date(established_date)
-                processed['established_date'] = date_obj.date() if date_obj else None
-            elif isinstance(established_date, datetime):
-                processed['established_date'] = established_date.date()
-            else:
-                processed['established_date'] = None
-        else:
-            processed['established_date'] = None
-        
-        # 数値の処理
-        employee_count = raw_data.get('employee_count')
-        if employee_count:
-            if isinstance(employee_count, (int, float)):
-                processed['employee_count'] = int(employee_count)
-            elif isinstance(employee_count, str):
-                processed['employee_count'] = utils.extract_numbers(employee_count)
-            else:
-                processed['employee_count'] = None
-        else:
-            processed['employee_count'] = None
-        
-        annual_sales = raw_data.get('annual_sales')
-        if annual_sales:
-            if isinstance(annual_sales, (int, float)):
-                processed['annual_sales'] = int(annual_sales)
-            elif isinstance(annual_sales, str):
-                processed['annual_sales'] = utils.extract_numbers(annual_sales)
-            else:
-                processed['annual_sales'] = None
-        else:
-            processed['annual_sales'] = None
-        
-        # その他の項目
-        processed['product_categories'] = utils.clean_text(raw_data.get('product_categories'))
-        
-        email = raw_data.get('email')
-        if email and utils.validate_email(email):
-            processed['email'] = email.strip()
-        else:
-            processed['email'] = None
-        
-        processed['notes'] = utils.clean_text(raw_data.get('notes'))
+        if is_dataclass(raw_data):
+            raw_data = asdict(raw_data)
+        get = raw_data.get
+        clean_text = utils.clean_text
         
-        # 必須項目の検証
-        if not processed.get('company_name'):
-            logger.warning("事業所名が空のため、データをスキップします")
+        # 必須項目の検証（事業所名がなければ他の項目は整形しない）
+        company_name = clean_text(get('company_name'))
+        if not company_name:
+            logger.debug("事業所名が空のため、データをスキップします")
             return None
         
-        return processed
+        email = get('email')
+        
+        return {
+            # 必須項目の処理
+            'company_name': company_name,
+            'address': clean_text(get('address')),
+            'postal_code': utils.normalize_postal_code(get('postal_code')),
+            'phone_number': utils.normalize_phone_number(get('phone_number')),
+            'website_url': utils.normalize_url(get('website_url')),
+            'source_url': get('source_url'),
+            # 任意項目の処理
+            'company_number': clean_text(get('company_number')),
+            'representative': clean_text(get('representative')),
+            'established_date': _to_date(get('established_date')),
+            'employee_count': _to_int(get('employee_count')),
+            'annual_sales': _to_int(get('annual_sales')),
+            # その他の項目
+            'product_categories': clean_text(get('product_categories')),
+            'email': email.strip() if email and utils.validate_email(email) else None,
+            'notes': clean_text(get('notes')),
+        }
     
     def process_companies_batch(self, raw_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         複数の事業所データを一括整形
         
+        件数がPARALLEL_THRESHOLDを超える場合はプロセスプールで並列に整形する。
+        （列単位で整形するprocess_companies_batch_vectorizedとは別の方式）
+        
         Args:
             raw_data_list: 生データのリスト
             
         Returns:
             整形されたデータのリスト
         """
-        processed_list = []
+        if len(raw_data_list) > PARALLEL_THRESHOLD:
+            with utils.worker_process_pool() as executor:
+                results = list(executor.map(_process_one, raw_data_list, chunksize=PARALLEL_CHUNK_SIZE))
+        else:
+            results = [self.process_company_data(raw_data) for raw_data in raw_data_list]
         
-        for raw_data in raw_data_list:
-            processed = self.process_company_data(raw_data)
-            if processed:
-                processed_list.append(processed)
-            else:
-                logger.warning("データの整形に失敗しました")
+        processed_list = [processed for processed in results if processed]
         
+        failed_count = len(raw_data_list) - len(processed_list)
+        if failed_count:
+            logger.warning(f"{failed_count}件のデータの整形に失敗しました")
         logger.info(f"{len(processed_list)}/{len(raw_data_list)}件のデータを整形しました")
         return processed_list
     
+    def process_companies_batch_vectorized(
+        self,
+        raw_data_list: Union[List[Any], Dict[str, List[Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        複数の事業所データをpandasの列演算で一括整形
+        
+        process_companies_batchと同じ整形ルールを列単位で適用する。
+        行ごとの辞書に加え、項目名をキーとする列形式のデータも受け付ける。
+        列形式の場合は行ごとの辞書を経由せずにDataFrameを構築する。
+        データクラス（scraper.CompanyRowなど）のリストは列形式に変換して扱う。
+        DataFrameの構築と辞書への変換の分だけ、通常の件数ではprocess_companies_batchより遅い。
+        
+        Args:
+            raw_data_list: 生データ（辞書またはデータクラス）のリスト、または項目ごとの値のリスト
+            
+        Returns:
+            整形されたデータのリスト
+        """
+        if not raw_data_list:
+            return []
+        
+        if isinstance(raw_data_list, list) and is_dataclass(raw_data_list[0]):
+            raw_data_list = {
+                field.name: [getattr(row, field.name) for row in raw_data_list]
+                for field in fields(raw_data_list[0])
+            }
+        
+        raw = pd.DataFrame(raw_data_list).reindex(columns=_OUTPUT_COLUMNS)
+        if raw.empty:
+            return []
+        df = pd.DataFrame(index=raw.index)
+        
+        # テキスト項目：前後の空白除去・連続空白の統一、空文字はNone
+        for column in _TEXT_COLUMNS:
+            df[column] = self._clean_text_series(raw[column])
+        
+        df['postal_code'] = self._normalize_postal_code_series(raw['postal_code'])
+        df['phone_number'] = self._normalize_phone_number_series(raw['phone_number'])
+        
+        # URL：プロトコルがない場合は追加
+        url = self._as_string(raw['website_url']).str.strip().replace('', pd.NA)
+        has_scheme = url.str.slice(0, 8).str.lower().str.startswith(('http://', 'https://'))
+        df['website_url'] = url.where(has_scheme, 'https://' + url)
+        df['source_url'] = raw['source_url']
+        
+        # 日付：utils.parse_dateと同じパターンで年月日を取り出して解析
+        parsed = self._parse_date_series(self._as_string(raw['established_date']).str.strip())
+        is_datetime = raw['established_date'].map(lambda value: isinstance(value, datetime))
+        if is_datetime.any():
+            parsed = parsed.fillna(pd.to_datetime(raw['established_date'].where(is_datetime), errors='coerce'))
+        df['established_date'] = parsed.dt.date
+        
+        df['employee_count'] = self._extract_numbers_series(raw['employee_count'])
+        df['annual_sales'] = self._extract_numbers_series(raw['annual_sales'])
+        
+        email = self._as_string(raw['email'])
+        df['email'] = email.str.strip().where(email.str.fullmatch(utils.EMAIL_RE).fillna(False))
+        
+        # 必須項目の検証
+        valid = df['company_name'].notna()
+        skipped = int((~valid).sum())
+        if skipped:
+            logger.warning(f"事業所名が空のため、{skipped}件のデータをスキップします")
+        
+        df = df.loc[valid, _OUTPUT_COLUMNS].astype(object)
+        processed_list = df.where(df.notna(), None).to_dict('records')
+        
+        logger.info(f"{len(processed_list)}/{len(raw)}件のデータを整形しました")
+        return processed_list
+    
+    @staticmethod
+    def _as_string(series: pd.Series) -> pd.Series:
+        """文字列以外の値を欠損値として扱う文字列Seriesに変換"""
+        return series.where(series.map(type) == str).astype('string')
+    
+    @classmethod
+    def _clean_text_series(cls, series: pd.Series) -> pd.Series:
+        """utils.clean_textの列版"""
+        text = cls._as_string(series).str.replace(utils.WHITESPACE_RE, ' ', regex=True).str.strip()
+        return text.replace('', pd.NA)
+    
+    @classmethod
+    def _normalize_postal_code_series(cls, series: pd.Series) -> pd.Series:
+        """utils.normalize_postal_codeの列版"""
+        postal_code = cls._as_string(series).replace('', pd.NA)
+        digits = postal_code.str.replace(utils.NON_DIGIT_RE, '', regex=True)
+        digits = digits.where(digits.str.len() != 6, '0' + digits)
+        formatted = digits.str.slice(0, 3) + '-' + digits.str.slice(3)
+        return formatted.where(digits.str.len() == 7, postal_code)
+    
+    @classmethod
+    def _normalize_phone_number_series(cls, series: pd.Series) -> pd.Series:
+        """utils.normalize_phone_numberの列版"""
+        phone = cls._as_string(series).replace('', pd.NA)
+        phone = phone.str.replace(utils.PHONE_STRIP_RE, '', regex=True)
+        digits = phone.str.replace(utils.NON_DIGIT_RE, '', regex=True)
+        length = digits.str.len()
+        landline = digits.str.slice(0, 2) + '-' + digits.str.slice(2, 6) + '-' + digits.str.slice(6)
+        mobile = digits.str.slice(0, 3) + '-' + digits.str.slice(3, 7) + '-' + digits.str.slice(7)
+        formatted = phone.where(length != 10, landline).where(length != 11, mobile)
+        return phone.where(phone.str.fullmatch(utils.PHONE_FORMAT_RE).fillna(False), formatted)
+    
+    @staticmethod
+    def _parse_date_series(dates: pd.Series) -> pd.Series:
+        """utils.parse_dateの列版（datetime64のSeriesを返す）"""
+        ymd = dates.where(dates.str.fullmatch(utils.DATE_RE)).str.extract(utils.DATE_RE)[[0, 2, 3]]
+        jp_ymd = dates.where(dates.str.fullmatch(utils.JP_DATE_RE)).str.extract(utils.JP_DATE_RE)
+        ymd = ymd.set_axis(['year', 'month', 'day'], axis=1).fillna(
+            jp_ymd.set_axis(['year', 'month', 'day'], axis=1)
+        )
+        parsed = pd.to_datetime(ymd.apply(pd.to_numeric, errors='coerce').astype('float64'), errors='coerce')
+        
+        # パターンに一致しない形式・ASCII以外の数字を含む年などは1件ずつ解析
+        unparsed = parsed.isna() & dates.notna()
+        if unparsed.any():
+            parsed[unparsed] = pd.to_datetime(dates[unparsed].map(utils.parse_date), errors='coerce')
+        return parsed
+    
+    @classmethod
+    def _extract_numbers_series(cls, series: pd.Series) -> pd.Series:
+        """数値はそのまま、文字列は数字のみを抽出して整数に変換"""
+        numbers = pd.to_numeric(series.where(series.map(type) != str), errors='coerce')
+        numbers = np.trunc(numbers.where(numbers != 0))
+        text = cls._as_string(series)
+        digits = text.str.replace(utils.NON_DIGIT_RE, '', regex=True).replace('', pd.NA)
+        from_text = pd.to_numeric(digits, errors='coerce')
+        
+        # 全角数字などASCII以外の数字はto_numericで解析できないため1件ずつ変換
+        unparsed = from_text.isna() & digits.notna()
+        if unparsed.any():
+            from_text[unparsed] = text[unparsed].map(utils.extract_numbers)
+        return numbers.fillna(from_text).astype('Int64')
+    
     def validate_required_fields(self, data: Dict[str, Any]) -> bool:
         """
         必須項目の検証
@@ -147,17 +293,13 @@ class DataProcessor:
         Returns:
             重複を除去したデータのリスト
         """
-        seen = set()
-        unique_list = []
-        
-        for data in data_list:
-            value = data.get(key)
-            if value and value not in seen:
-                seen.add(value)
-                unique_list.append(data)
-            elif not value:
-                # キーが存在しない場合はそのまま追加
-                unique_list.append(data)
+        if not data_list:
+            return []
+        
+        # キーの値のみをpandasで重複判定（キーが存在しない場合はそのまま残す）
+        values = pd.Series([data.get(key) for data in data_list], dtype=object)
+        keep = ~values.astype(bool) | ~values.duplicated(keep='first')
+        unique_list = list(compress(data_list, keep.to_numpy()))
         
         removed_count = len(data_list) - len(unique_list)
         if removed_count > 0:
@@ -165,3 +307,7 @@ class DataProcessor:
         
         return unique_list
 
+
+def _process_one(raw_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """プロセスプールのワーカーで1件を整形（pickle可能なモジュール関数）"""
+    return DataProcessor().process_company_data(raw_data)
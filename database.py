@@ -4,11 +4,15 @@ SQLiteデータベースへの接続、テーブル作成、CRUD操作を提供
 """
 import logging
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Date, DateTime, Text
+from sqlalchemy import (
+    create_engine, event, inspect, select, text, func, type_coerce, bindparam, lambda_stmt,
+    Column, Integer, String, Date, DateTime, Text, MetaData, Table
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.exc import SQLAlchemyError
-from typing import Optional, List, Dict, Any
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError, OperationalError
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 import config
 
 logger = logging.getLogger(__name__)
@@ -16,6 +20,24 @@ logger = logging.getLogger(__name__)
 Base = declarative_base()
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """接続ごとにSQLiteのPRAGMAを設定（WALモードで書き込みを高速化）"""
+    # トランザクション開始はSQLAlchemy側で制御する（DDLも含めてロールバック可能にする）
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256MB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64MB
+    cursor.close()
+
+
+def _begin_sqlite_transaction(conn):
+    """明示的にBEGINを発行"""
+    conn.exec_driver_sql("BEGIN")
+
+
 class ECCompany(Base):
     """通販事業所データモデル"""
     __tablename__ = 'ec_companies'
@@ -25,7 +47,7 @@ class ECCompany(Base):
     address = Column(Text)
     postal_code = Column(String(10), index=True)
     phone_number = Column(String(20))
-    website_url = Column(Text, index=True)
+    website_url = Column(Text, unique=True, index=True)
     company_number = Column(String(20))
     representative = Column(String(100))
     established_date = Column(Date)
@@ -61,6 +83,90 @@ class ECCompany(Base):
         }
 
 
+# 一括処理で扱うカラム（id・作成日時・更新日時は自動設定）
+_DATA_COLUMNS = [
+    c.name for c in ECCompany.__table__.columns
+    if c.name not in ('id', 'created_at', 'updated_at')
+]
+
+# website_urlのUNIQUEインデックス名
+WEBSITE_URL_INDEX = 'ix_ec_companies_website_url'
+
+# 事業所名の全文検索用FTS5テーブル（trigramトークナイザで日本語の部分一致に対応）
+FTS_TABLE = 'ec_companies_fts'
+# trigramトークナイザで検索できる最小文字数（これより短い場合はLIKE検索）
+FTS_MIN_QUERY_LENGTH = 3
+
+_fts_table = Table(FTS_TABLE, MetaData(), Column('rowid', Integer), Column('company_name', Text))
+
+_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS ec_companies_fts USING fts5("
+    "company_name, content='ec_companies', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS ec_companies_fts_ai AFTER INSERT ON ec_companies BEGIN "
+    "INSERT INTO ec_companies_fts(rowid, company_name) VALUES (new.id, new.company_name); END",
+    "CREATE TRIGGER IF NOT EXISTS ec_companies_fts_ad AFTER DELETE ON ec_companies BEGIN "
+    "INSERT INTO ec_companies_fts(ec_companies_fts, rowid, company_name) "
+    "VALUES ('delete', old.id, old.company_name); END",
+    "CREATE TRIGGER IF NOT EXISTS ec_companies_fts_au AFTER UPDATE OF company_name ON ec_companies BEGIN "
+    "INSERT INTO ec_companies_fts(ec_companies_fts, rowid, company_name) "
+    "VALUES ('delete', old.id, old.company_name); "
+    "INSERT INTO ec_companies_fts(rowid, company_name) VALUES (new.id, new.company_name); END",
+)
+
+# bulk_loadで一度に挿入する件数
+BULK_LOAD_CHUNK_SIZE = 10000
+
+
+def _iso_date_column(column):
+    """日付・日時カラムをSQLite上でISO形式の文字列に変換する式を返す"""
+    if isinstance(column.type, DateTime):
+        # SQLiteには'YYYY-MM-DD HH:MM:SS.ffffff'形式で保存されている
+        return type_coerce(func.replace(column, ' ', 'T'), String).label(column.name)
+    if isinstance(column.type, Date):
+        return type_coerce(column, String).label(column.name)
+    return column
+
+
+# 繰り返し実行するステートメント（生成は一度のみ）
+_STMT_LOOKUP_BY_URL = select(ECCompany).where(ECCompany.website_url == bindparam('website_url'))
+_STMT_COUNT = select(func.count()).select_from(ECCompany)
+
+# 日付をPythonオブジェクトに変換せず文字列のまま取得するSELECT（エクスポート用）
+_ISO_DATE_SELECT = select(*[_iso_date_column(c) for c in ECCompany.__table__.columns])
+
+
+def _to_rows(companies_data: List[Dict[str, Any]], now: datetime) -> List[Dict[str, Any]]:
+    """executemany用に各データのキーを揃える（作成日時・更新日時はnowで統一）"""
+    rows = []
+    for data in companies_data:
+        row = {name: data.get(name) for name in _DATA_COLUMNS}
+        # 空文字のURLはUNIQUE制約の対象外とするためNoneに統一
+        row['website_url'] = row['website_url'] or None
+        row['created_at'] = now
+        row['updated_at'] = now
+        rows.append(row)
+    return rows
+
+
+def _merge_duplicate_urls(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    website_urlが重複する行を1行にまとめる
+    
+    add_companies_batchのUPSERTと同じく、後の行のNone以外の値で前の行を上書きする。
+    website_urlがNoneの行はそのまま残す。
+    """
+    merged: Dict[Any, Dict[str, Any]] = {}
+    for index, row in enumerate(rows):
+        url = row['website_url']
+        if url is None:
+            merged[index] = row
+        elif url in merged:
+            merged[url].update((name, value) for name, value in row.items() if value is not None)
+        else:
+            merged[url] = row
+    return list(merged.values())
+
+
 class DatabaseManager:
     """データベース管理クラス"""
     
@@ -72,19 +178,72 @@ class DatabaseManager:
             database_path: データベースファイルのパス
         """
         self.database_path = database_path or config.DATABASE_PATH
-        self.engine = create_engine(f'sqlite:///{self.database_path}', echo=False)
+        self.engine = create_engine(
+            f'sqlite:///{self.database_path}',
+            echo=False,
+            connect_args={'check_same_thread': False}
+        )
+        event.listen(self.engine, 'connect', _set_sqlite_pragmas)
+        event.listen(self.engine, 'begin', _begin_sqlite_transaction)
         self.SessionLocal = sessionmaker(bind=self.engine)
         self._create_tables()
     
     def _create_tables(self):
         """テーブルを作成"""
         try:
-            Base.metadata.create_all(self.engine)
-            logger.info(f"データベーステーブルを作成しました: {self.database_path}")
+            inspector = inspect(self.engine)
+            if inspector.has_table(ECCompany.__tablename__):
+                self._migrate_unique_website_url(inspector)
+            else:
+                Base.metadata.create_all(self.engine)
+                logger.info(f"データベーステーブルを作成しました: {self.database_path}")
+            self.fts_enabled = self._create_fts_table(inspector)
         except SQLAlchemyError as e:
             logger.error(f"テーブル作成エラー: {e}")
             raise
     
+    def _create_fts_table(self, inspector) -> bool:
+        """
+        事業所名の全文検索テーブルと同期用トリガーを作成
+        
+        Returns:
+            全文検索が利用可能な場合はTrue
+        """
+        if inspector.has_table(FTS_TABLE):
+            return True
+        
+        try:
+            with self.engine.begin() as conn:
+                for ddl in _FTS_DDL:
+                    conn.execute(text(ddl))
+                # 既存データを索引に登録
+                conn.execute(text("INSERT INTO ec_companies_fts(ec_companies_fts) VALUES ('rebuild')"))
+            logger.info("全文検索テーブルを作成しました")
+            return True
+        except OperationalError as e:
+            # FTS5・trigramトークナイザが使えないSQLiteの場合は部分一致検索を使用
+            logger.warning(f"全文検索テーブルを作成できませんでした: {e}")
+            return False
+    
+    def _migrate_unique_website_url(self, inspector):
+        """既存データベースのwebsite_urlインデックスをUNIQUEに移行"""
+        existing = {ix['name']: ix for ix in inspector.get_indexes(ECCompany.__tablename__)}
+        if existing.get(WEBSITE_URL_INDEX, {}).get('unique'):
+            return
+        
+        index = next(ix for ix in ECCompany.__table__.indexes if ix.name == WEBSITE_URL_INDEX)
+        with self.engine.begin() as conn:
+            # 空文字のURLはNULLに統一し、重複するURLは最初に登録されたデータのみ残す
+            conn.execute(text("UPDATE ec_companies SET website_url = NULL WHERE website_url = ''"))
+            result = conn.execute(text(
+                "DELETE FROM ec_companies WHERE website_url IS NOT NULL AND rowid NOT IN ("
+                "SELECT MIN(rowid) FROM ec_companies WHERE website_url IS NOT NULL GROUP BY website_url)"
+            ))
+            index.drop(conn, checkfirst=True)
+            index.create(conn)
+        
+        logger.info(f"website_urlのインデックスをUNIQUEに移行しました（重複データ{result.rowcount}件を削除）")
+    
     def get_session(self) -> Session:
         """セッションを取得"""
         return self.SessionLocal()
@@ -99,14 +258,17 @@ class DatabaseManager:
         Returns:
             追加されたECCompanyオブジェクト、失敗時はNone
         """
+        # 空文字のURLはUNIQUE制約の対象外とするためNoneに統一
+        company_data = {**company_data, 'website_url': company_data.get('website_url') or None}
+        
         session = self.get_session()
         try:
             # 既存データのチェック（website_urlで重複チェック）
             existing = None
-            if company_data.get('website_url'):
-                existing = session.query(ECCompany).filter_by(
-                    website_url=company_data['website_url']
-                ).first()
+            if company_data['website_url']:
+                existing = session.execute(
+                    _STMT_LOOKUP_BY_URL, {'website_url': company_data['website_url']}
+                ).scalar_one_or_none()
             
             if existing:
                 # 既存データを更新
@@ -141,38 +303,84 @@ class DatabaseManager:
         Returns:
             追加されたデータ数
         """
-        session = self.get_session()
-        count = 0
+        if not companies_data:
+            return 0
+        
+        table = ECCompany.__table__
+        now = datetime.now()
+        rows = _to_rows(companies_data, now)
+        rows_with_url = [row for row in rows if row['website_url']]
+        rows_without_url = [row for row in rows if not row['website_url']]
+        
+        # website_urlが重複する場合は、None以外の値のみで既存データを更新
+        stmt = sqlite_insert(table)
+        update_values = {
+            name: func.coalesce(stmt.excluded[name], table.c[name])
+            for name in _DATA_COLUMNS if name != 'website_url'
+        }
+        update_values['updated_at'] = now
+        stmt = stmt.on_conflict_do_update(index_elements=['website_url'], set_=update_values)
+        
         try:
-            for company_data in companies_data:
-                # 既存データのチェック
-                existing = None
-                if company_data.get('website_url'):
-                    existing = session.query(ECCompany).filter_by(
-                        website_url=company_data['website_url']
-                    ).first()
-                
-                if existing:
-                    # 既存データを更新
-                    for key, value in company_data.items():
-                        if hasattr(existing, key) and value is not None:
-                            setattr(existing, key, value)
-                    existing.updated_at = datetime.now()
-                else:
-                    # 新規データを追加
-                    company = ECCompany(**company_data)
-                    session.add(company)
-                    count += 1
+            with self.engine.begin() as conn:
+                before = conn.execute(_STMT_COUNT).scalar()
+                if rows_with_url:
+                    conn.execute(stmt, rows_with_url)
+                if rows_without_url:
+                    conn.execute(table.insert(), rows_without_url)
+                count = conn.execute(_STMT_COUNT).scalar() - before
             
-            session.commit()
             logger.info(f"{count}件の新規データを追加しました")
             return count
         except SQLAlchemyError as e:
-            session.rollback()
             logger.error(f"一括追加エラー: {e}")
             return 0
-        finally:
-            session.close()
+    
+    def bulk_load(self, companies_data: List[Dict[str, Any]], rebuild_indexes: bool = True) -> int:
+        """
+        事業所データを高速に一括投入（初回ロード用）
+        
+        空のテーブルへの投入を想定し、既存データとの重複チェックは事前に行わない。
+        投入データ内でwebsite_urlが重複する場合は、add_companies_batchと同じく後のデータで上書きする。
+        既存データとwebsite_urlが重複した場合は、add_companies_batchで追加し直す。
+        rebuild_indexesがTrueの場合、投入中はインデックスを削除し最後に再作成する。
+        
+        Args:
+            companies_data: 事業所データのリスト
+            rebuild_indexes: インデックスを削除・再作成するかどうか
+            
+        Returns:
+            追加されたデータ数
+        """
+        if not companies_data:
+            return 0
+        
+        table = ECCompany.__table__
+        now = datetime.now()
+        rows = _merge_duplicate_urls(_to_rows(companies_data, now))
+        
+        try:
+            with self.engine.begin() as conn:
+                if rebuild_indexes:
+                    for index in table.indexes:
+                        index.drop(conn, checkfirst=True)
+                
+                for start in range(0, len(rows), BULK_LOAD_CHUNK_SIZE):
+                    conn.execute(table.insert(), rows[start:start + BULK_LOAD_CHUNK_SIZE])
+                
+                if rebuild_indexes:
+                    for index in table.indexes:
+                        index.create(conn)
+            
+            logger.info(f"{len(rows)}件のデータを一括投入しました")
+            return len(rows)
+        except IntegrityError as e:
+            # トランザクションはロールバック済み（削除したインデックスも元に戻る）
+            logger.warning(f"既存データとURLが重複したため一括追加に切り替えます: {e.orig}")
+            return self.add_companies_batch(companies_data)
+        except SQLAlchemyError as e:
+            logger.error(f"一括投入エラー: {e}")
+            return 0
     
     def search_companies(
         self,
@@ -184,7 +392,7 @@ class DatabaseManager:
         事業所データを検索
         
         Args:
-            company_name: 事業所名（部分一致）
+            company_name: 事業所名（部分一致、3文字以上は全文検索を使用）
             postal_code: 郵便番号
             limit: 取得件数の上限
             
@@ -193,15 +401,24 @@ class DatabaseManager:
         """
         session = self.get_session()
         try:
-            query = session.query(ECCompany)
+            # lambda_stmtによりSQLのコンパイル結果を条件の組み合わせごとにキャッシュ
+            stmt = lambda_stmt(lambda: select(ECCompany))
             
-            if company_name:
-                query = query.filter(ECCompany.company_name.like(f'%{company_name}%'))
+            if company_name and self.fts_enabled and len(company_name) >= FTS_MIN_QUERY_LENGTH:
+                # 全文検索（フレーズ検索として部分一致）
+                phrase = '"' + company_name.replace('"', '""') + '"'
+                stmt += lambda s: s.join(_fts_table, ECCompany.id == _fts_table.c.rowid).where(
+                    _fts_table.c.company_name.match(phrase)
+                )
+            elif company_name:
+                pattern = f'%{company_name}%'
+                stmt += lambda s: s.where(ECCompany.company_name.like(pattern))
             
             if postal_code:
-                query = query.filter(ECCompany.postal_code == postal_code)
+                stmt += lambda s: s.where(ECCompany.postal_code == postal_code)
             
-            results = query.limit(limit).all()
+            stmt += lambda s: s.limit(limit)
+            results = session.scalars(stmt).all()
             logger.info(f"{len(results)}件のデータを取得しました")
             return results
         except SQLAlchemyError as e:
@@ -210,40 +427,124 @@ class DatabaseManager:
         finally:
             session.close()
     
-    def get_all_companies(self, limit: int = None) -> List[ECCompany]:
+    def get_all_companies(self, limit: int = None, chunk_size: int = 10000) -> Iterator[ECCompany]:
         """
         すべての事業所データを取得
         
+        chunk_size件ずつ読み込みながら返すため、全件をメモリに展開しない。
+        
         Args:
             limit: 取得件数の上限
+            chunk_size: 一度に読み込む件数
             
-        Returns:
-            事業所データのリスト
+        Yields:
+            事業所データ
         """
+        stmt = select(ECCompany)
+        if limit:
+            stmt = stmt.limit(limit)
+        stmt = stmt.execution_options(yield_per=chunk_size)
+        
         session = self.get_session()
+        count = 0
         try:
-            query = session.query(ECCompany)
-            if limit:
-                results = query.limit(limit).all()
-            else:
-                results = query.all()
-            logger.info(f"{len(results)}件のデータを取得しました")
-            return results
+            for company in session.scalars(stmt):
+                count += 1
+                yield company
+            logger.info(f"{count}件のデータを取得しました")
         except SQLAlchemyError as e:
             logger.error(f"データ取得エラー: {e}")
-            return []
         finally:
             session.close()
     
+    def get_company_rows(self, limit: int = None, iso_dates: bool = False) -> Tuple[List[str], List[Tuple]]:
+        """
+        すべての事業所データをORMを介さずに取得（エクスポート用）
+        
+        Args:
+            limit: 取得件数の上限
+            iso_dates: Trueの場合、日付・日時カラムをISO形式の文字列として取得
+            
+        Returns:
+            カラム名のリストと行データのリストのタプル
+        """
+        stmt = _ISO_DATE_SELECT if iso_dates else select(ECCompany.__table__)
+        if limit:
+            stmt = stmt.limit(limit)
+        
+        try:
+            with self.engine.connect() as conn:
+                result = conn.execute(stmt)
+                columns = list(result.keys())
+                rows = result.fetchall()
+            logger.info(f"{len(rows)}件のデータを取得しました")
+            return columns, rows
+        except SQLAlchemyError as e:
+            logger.error(f"データ取得エラー: {e}")
+            return [], []
+    
+    def iter_company_rows(self, chunk_size: int = 5000, iso_dates: bool = False) -> Iterator[List[Tuple]]:
+        """
+        すべての事業所データをサーバーサイドカーソルで分割して取得
+        
+        行データはchunk_size件ずつ返すため、メモリ使用量は件数に依存しない。
+        
+        Args:
+            chunk_size: 一度に取得する件数
+            iso_dates: Trueの場合、日付・日時カラムをISO形式の文字列として取得
+            
+        Yields:
+            行データのリスト（カラム順はECCompanyのテーブル定義に従う）
+        """
+        stmt = _ISO_DATE_SELECT if iso_dates else select(ECCompany.__table__)
+        stmt = stmt.execution_options(stream_results=True, yield_per=chunk_size)
+        with self.engine.connect() as conn:
+            for partition in conn.execute(stmt).partitions():
+                yield partition
+    
+    def get_summary_stats(self) -> Dict[str, Any]:
+        """
+        サマリー用の統計情報をSQLの集計関数で取得
+        
+        Returns:
+            総数・URL登録数・メールアドレス登録数・従業員数平均・売上高合計の辞書
+        """
+        table = ECCompany.__table__
+        stmt = select(
+            func.count(),
+            func.count(func.nullif(table.c.website_url, '')),
+            func.count(func.nullif(table.c.email, '')),
+            func.avg(func.nullif(table.c.employee_count, 0)),
+            func.coalesce(func.sum(table.c.annual_sales), 0)
+        )
+        keys = ['total', 'with_url', 'with_email', 'avg_employee_count', 'total_annual_sales']
+        
+        try:
+            with self.engine.connect() as conn:
+                row = conn.execute(stmt).one()
+            return dict(zip(keys, row))
+        except SQLAlchemyError as e:
+            logger.error(f"統計情報取得エラー: {e}")
+            return dict.fromkeys(keys, 0)
+    
     def get_company_count(self) -> int:
         """データベース内の事業所数を取得"""
         session = self.get_session()
         try:
-            count = session.query(ECCompany).count()
-            return count
+            return session.scalar(_STMT_COUNT)
         except SQLAlchemyError as e:
             logger.error(f"カウント取得エラー: {e}")
             return 0
         finally:
             session.close()
 
+
+_db_manager: Optional[DatabaseManager] = None
+
+
+def get_db_manager() -> DatabaseManager:
+    """共有のDatabaseManagerインスタンスを取得（初回のみ生成）"""
+    global _db_manager
+    if _db_manager is None:
+        _db_manager = DatabaseManager()
+    return _db_manager
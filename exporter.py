@@ -3,15 +3,72 @@
 データベースからデータを取得してCSV/Excel形式でエクスポート
 """
 import logging
-from pathlib import Path
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+from datetime import date, datetime
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import xlsxwriter
+from sqlalchemy import Date, DateTime, Integer
+from sqlalchemy.exc import SQLAlchemyError
 from database import DatabaseManager, ECCompany
 import config
 
 logger = logging.getLogger(__name__)
 
+# Excelで文字化けしないようにCSVの先頭に付与するBOM（utf-8-sig相当）
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+# ISO形式の文字列に変換する日付・日時カラム
+_DATE_COLUMNS = ('established_date', 'created_at', 'updated_at')
+
+
+def _isoformat(value: Optional[date]) -> Optional[str]:
+    """
+    日付・日時をISO形式の文字列に変換
+    
+    pandasのdatetime64を経由しないため、1677年〜2262年の範囲外の日付も変換できる。
+    日時はDatabaseManager.iter_company_rows(iso_dates=True)と同じくマイクロ秒まで出力する。
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat(timespec='microseconds')
+    return value.isoformat()
+
+
+def _arrow_schema(iso_dates: bool) -> pa.Schema:
+    """ECCompanyのテーブル定義からpyarrowのスキーマを生成（iso_datesがTrueの場合、日付・日時は文字列）"""
+    fields = []
+    for column in ECCompany.__table__.columns:
+        if isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, DateTime) and not iso_dates:
+            arrow_type = pa.timestamp('us')
+        elif isinstance(column.type, Date) and not iso_dates:
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+# CSV出力用のスキーマ（export_to_csvとexport_to_csv_streamingで同じ書式になるよう共通化）
+_CSV_SCHEMA = _arrow_schema(iso_dates=True)
+# Parquet出力用のスキーマ（整数・日付・日時の型を保持する）
+_PARQUET_SCHEMA = _arrow_schema(iso_dates=False)
+
+# xlsxwriterのWorkbookオプション
+# 文字列はURL・数式・数値に自動変換せずそのまま書き込む
+# （ハイパーリンク数の上限超過や長いURLによる欠落、数式インジェクションを防ぐ）
+_WORKBOOK_OPTIONS = {
+    'constant_memory': True,
+    'strings_to_urls': False,
+    'strings_to_formulas': False,
+    'strings_to_numbers': False,
+}
+
 
 class DataExporter:
     """データエクスポートクラス"""
@@ -24,22 +81,59 @@ class DataExporter:
             db_manager: DatabaseManagerインスタンス
         """
         self.db_manager = db_manager
-        self.export_dir = Path(config.BASE_DIR) / 'data' / 'exports'
+        self.export_dir = config.EXPORT_DIR
         self.export_dir.mkdir(parents=True, exist_ok=True)
     
-    def companies_to_dataframe(self, companies: List[ECCompany]) -> pd.DataFrame:
+    def companies_to_dataframe(self, companies: List[ECCompany], iso_dates: bool = True) -> pd.DataFrame:
         """
         事業所データのリストをDataFrameに変換
         
         Args:
             companies: ECCompanyオブジェクトのリスト
+            iso_dates: Trueの場合、日付・日時カラムをISO形式の文字列に変換
             
         Returns:
             pandas DataFrame
         """
-        data = [company.to_dict() for company in companies]
-        df = pd.DataFrame(data)
-        return df
+        columns = {column.name: [] for column in ECCompany.__table__.columns}
+        for company in companies:
+            for name, values in columns.items():
+                values.append(getattr(company, name))
+        if iso_dates:
+            for name in _DATE_COLUMNS:
+                columns[name] = [_isoformat(value) for value in columns[name]]
+        return pd.DataFrame(columns)
+    
+    def rows_to_dataframe(self, columns: List[str], rows: Sequence[Tuple]) -> pd.DataFrame:
+        """
+        DatabaseManager.get_company_rowsの結果をDataFrameに変換
+        
+        日付・日時カラムは取得時の形式のまま（iso_dates=Trueで取得した場合は文字列）となる。
+        
+        Args:
+            columns: カラム名のリスト
+            rows: 行データのリスト
+            
+        Returns:
+            pandas DataFrame
+        """
+        return pd.DataFrame.from_records(rows, columns=columns)
+    
+    def _load_dataframe(
+        self,
+        companies: Optional[List[ECCompany]],
+        search_params: Optional[dict],
+        iso_dates: bool = True
+    ) -> pd.DataFrame:
+        """エクスポート対象のデータをDataFrameとして取得"""
+        if companies is not None:
+            return self.companies_to_dataframe(companies, iso_dates)
+        if search_params:
+            return self.companies_to_dataframe(self.db_manager.search_companies(**search_params), iso_dates)
+        
+        # 全件の場合はORMを介さずに取得（日付の文字列変換もSQLite側で行う）
+        columns, rows = self.db_manager.get_company_rows(iso_dates=iso_dates)
+        return self.rows_to_dataframe(columns, rows)
     
     def export_to_csv(
         self,
@@ -59,19 +153,42 @@ class DataExporter:
             出力ファイルのパス
         """
         # データの取得
-        if companies is None:
-            if search_params:
-                companies = self.db_manager.search_companies(**search_params)
-            else:
-                companies = self.db_manager.get_all_companies()
+        df = self._load_dataframe(companies, search_params)
         
-        if not companies:
+        if df.empty:
             logger.warning("エクスポートするデータがありません")
             return None
         
-        # DataFrameに変換
-        df = self.companies_to_dataframe(companies)
+        # ファイル名の生成
+        if filename is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f'ec_companies_{timestamp}.csv'
+        
+        filepath = self.export_dir / filename
+        
+        # CSV出力（pyarrowのマルチスレッドCSVライターを使用）
+        table = pa.Table.from_pandas(df, schema=_CSV_SCHEMA, preserve_index=False)
+        with open(filepath, 'wb') as f:
+            f.write(_UTF8_BOM)
+            pa_csv.write_csv(table, f)
+        logger.info(f"CSVファイルを出力しました: {filepath} ({len(df)}件)")
+        
+        return str(filepath)
+    
+    def export_to_csv_streaming(self, filename: Optional[str] = None, chunk_size: int = 5000) -> str:
+        """
+        全データをCSV形式でストリーミング出力
         
+        DataFrameを経由せず、chunk_size件ずつ取得してpyarrowのCSVWriterで書き出すため、
+        大量データでもメモリ使用量が一定に保たれる（書式はexport_to_csvと同じ）。
+        
+        Args:
+            filename: 出力ファイル名（Noneの場合は自動生成）
+            chunk_size: 一度に取得・書き出しする件数
+            
+        Returns:
+            出力ファイルのパス
+        """
         # ファイル名の生成
         if filename is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -79,9 +196,65 @@ class DataExporter:
         
         filepath = self.export_dir / filename
         
-        # CSV出力
-        df.to_csv(filepath, index=False, encoding='utf-8-sig')
-        logger.info(f"CSVファイルを出力しました: {filepath} ({len(companies)}件)")
+        count = 0
+        try:
+            with open(filepath, 'wb') as f:
+                f.write(_UTF8_BOM)
+                with pa_csv.CSVWriter(f, _CSV_SCHEMA) as writer:
+                    # 日付はSQLite側でISO形式の文字列にしたものをそのまま書き出す
+                    for partition in self.db_manager.iter_company_rows(chunk_size, iso_dates=True):
+                        columns = dict(zip(_CSV_SCHEMA.names, zip(*partition)))
+                        writer.write_table(pa.Table.from_pydict(columns, schema=_CSV_SCHEMA))
+                        count += len(partition)
+        except SQLAlchemyError as e:
+            logger.error(f"データ取得エラー: {e}")
+            filepath.unlink(missing_ok=True)
+            return None
+        
+        if count == 0:
+            logger.warning("エクスポートするデータがありません")
+            filepath.unlink()
+            return None
+        
+        logger.info(f"CSVファイルを出力しました: {filepath} ({count}件)")
+        
+        return str(filepath)
+    
+    def export_to_parquet(
+        self,
+        companies: Optional[List[ECCompany]] = None,
+        filename: Optional[str] = None,
+        search_params: Optional[dict] = None
+    ) -> str:
+        """
+        データをParquet形式（zstd圧縮）でエクスポート
+        
+        Args:
+            companies: エクスポートする事業所データ（Noneの場合は全件）
+            filename: 出力ファイル名（Noneの場合は自動生成）
+            search_params: 検索パラメータ（companiesがNoneの場合に使用）
+            
+        Returns:
+            出力ファイルのパス
+        """
+        # データの取得（日付・日時は文字列にせず型を保持する）
+        df = self._load_dataframe(companies, search_params, iso_dates=False)
+        
+        if df.empty:
+            logger.warning("エクスポートするデータがありません")
+            return None
+        
+        # ファイル名の生成
+        if filename is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f'ec_companies_{timestamp}.parquet'
+        
+        filepath = self.export_dir / filename
+        
+        # Parquet出力
+        table = pa.Table.from_pandas(df, schema=_PARQUET_SCHEMA, preserve_index=False)
+        pq.write_table(table, filepath, compression='zstd')
+        logger.info(f"Parquetファイルを出力しました: {filepath} ({len(df)}件)")
         
         return str(filepath)
     
@@ -105,19 +278,12 @@ class DataExporter:
             出力ファイルのパス
         """
         # データの取得
-        if companies is None:
-            if search_params:
-                companies = self.db_manager.search_companies(**search_params)
-            else:
-                companies = self.db_manager.get_all_companies()
+        df = self._load_dataframe(companies, search_params)
         
-        if not companies:
+        if df.empty:
             logger.warning("エクスポートするデータがありません")
             return None
         
-        # DataFrameに変換
-        df = self.companies_to_dataframe(companies)
-        
         # ファイル名の生成
         if filename is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -126,10 +292,10 @@ class DataExporter:
         filepath = self.export_dir / filename
         
         # Excel出力
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
+        with xlsxwriter.Workbook(str(filepath), _WORKBOOK_OPTIONS) as workbook:
+            self._write_sheet(workbook, sheet_name, df)
         
-        logger.info(f"Excelファイルを出力しました: {filepath} ({len(companies)}件)")
+        logger.info(f"Excelファイルを出力しました: {filepath} ({len(df)}件)")
         
         return str(filepath)
     
@@ -140,10 +306,10 @@ class DataExporter:
         Returns:
             出力ファイルのパス
         """
-        # 全データを取得
-        companies = self.db_manager.get_all_companies()
+        # 統計情報を取得
+        stats = self.db_manager.get_summary_stats()
         
-        if not companies:
+        if not stats['total']:
             logger.warning("レポート用のデータがありません")
             return None
         
@@ -157,19 +323,16 @@ class DataExporter:
                 '売上高合計（万円）'
             ],
             '値': [
-                len(companies),
-                sum(1 for c in companies if c.website_url),
-                sum(1 for c in companies if c.email),
-                int(sum(c.employee_count for c in companies if c.employee_count) / 
-                    sum(1 for c in companies if c.employee_count)) if 
-                    sum(1 for c in companies if c.employee_count) > 0 else 0,
-                sum(c.annual_sales for c in companies if c.annual_sales) if 
-                    any(c.annual_sales for c in companies) else 0
+                stats['total'],
+                stats['with_url'],
+                stats['with_email'],
+                int(stats['avg_employee_count'] or 0),
+                stats['total_annual_sales']
             ]
         }
         
         df_summary = pd.DataFrame(summary_data)
-        df_data = self.companies_to_dataframe(companies)
+        df_data = self._load_dataframe(None, None)
         
         # ファイル名の生成
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -177,11 +340,24 @@ class DataExporter:
         filepath = self.export_dir / filename
         
         # Excel出力（サマリーとデータを別シートに）
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            df_summary.to_excel(writer, sheet_name='サマリー', index=False)
-            df_data.to_excel(writer, sheet_name='詳細データ', index=False)
+        with xlsxwriter.Workbook(str(filepath), _WORKBOOK_OPTIONS) as workbook:
+            self._write_sheet(workbook, 'サマリー', df_summary)
+            self._write_sheet(workbook, '詳細データ', df_data)
         
         logger.info(f"サマリーレポートを出力しました: {filepath}")
         
         return str(filepath)
-
+    
+    @staticmethod
+    def _write_sheet(workbook: xlsxwriter.Workbook, sheet_name: str, df: pd.DataFrame):
+        """
+        DataFrameをワークシートに1行ずつ書き込む
+        
+        constant_memoryモードでは書き込み済みの行がすぐにディスクへ出力されるため、
+        行の順番に書き込む必要がある。
+        """
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, df.columns)
+        values = df.astype(object).where(df.notna(), None)
+        for row_index, row in enumerate(values.itertuples(index=False, name=None), start=1):
+            worksheet.write_row(row_index, 0, row)
@@ -2,30 +2,45 @@
 メインスクリプト
 通販事業所データ取得システムのエントリーポイント
 """
+import atexit
 import logging
+import queue
 import sys
-from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener
 from typing import List, Optional
 import config
-from database import DatabaseManager
+from database import get_db_manager
 from scraper import WebScraper
 from data_processor import DataProcessor
 from exporter import DataExporter
 
 
 def setup_logging():
-    """ログ設定"""
+    """ログ設定（ファイル・標準出力への書き込みはバックグラウンドスレッドで実行）"""
     log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    log_file = Path(config.LOG_FILE)
+    log_file = config.LOG_FILE_PATH
     log_file.parent.mkdir(parents=True, exist_ok=True)
     
+    formatter = logging.Formatter(log_format)
+    handlers = [
+        logging.FileHandler(log_file, encoding='utf-8'),
+        logging.StreamHandler(sys.stdout)
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    # 書式はリスナー側のハンドラーで適用するため、キューにはメッセージのみを渡す
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    
     logging.basicConfig(
         level=getattr(logging, config.LOG_LEVEL),
-        format=log_format,
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[queue_handler]
     )
 
 
@@ -41,7 +56,7 @@ def scrape_and_save(urls: List[str]):
     logger.info("=== データ取得処理を開始します ===")
     
     # 各モジュールの初期化
-    db_manager = DatabaseManager()
+    db_manager = get_db_manager()
     scraper = WebScraper()
     processor = DataProcessor()
     
@@ -62,7 +77,11 @@ def scrape_and_save(urls: List[str]):
     
     # データベースに保存
     logger.info("データベースに保存します")
-    saved_count = db_manager.add_companies_batch(processed_data_list)
+    if db_manager.get_company_count() == 0:
+        # 初回ロードはインデックスを再作成する一括投入を使用
+        saved_count = db_manager.bulk_load(processed_data_list)
+    else:
+        saved_count = db_manager.add_companies_batch(processed_data_list)
     
     logger.info(f"=== データ取得処理が完了しました（{saved_count}件保存） ===")
 
@@ -72,20 +91,25 @@ def export_data(format_type: str = 'csv', search_params: Optional[dict] = None):
     データをエクスポート
     
     Args:
-        format_type: エクスポート形式（'csv' または 'excel'）
+        format_type: エクスポート形式（'csv'、'excel' または 'parquet'）
         search_params: 検索パラメータ
     """
     logger = logging.getLogger(__name__)
     
     logger.info("=== データエクスポート処理を開始します ===")
     
-    db_manager = DatabaseManager()
+    db_manager = get_db_manager()
     exporter = DataExporter(db_manager)
     
     if format_type.lower() == 'csv':
-        filepath = exporter.export_to_csv(search_params=search_params)
+        if search_params:
+            filepath = exporter.export_to_csv(search_params=search_params)
+        else:
+            filepath = exporter.export_to_csv_streaming()
     elif format_type.lower() == 'excel':
         filepath = exporter.export_to_excel(search_params=search_params)
+    elif format_type.lower() == 'parquet':
+        filepath = exporter.export_to_parquet(search_params=search_params)
     else:
         logger.error(f"サポートされていない形式です: {format_type}")
         return
@@ -102,13 +126,13 @@ def show_statistics():
     
     logger.info("=== データベース統計情報 ===")
     
-    db_manager = DatabaseManager()
+    db_manager = get_db_manager()
     count = db_manager.get_company_count()
     
     logger.info(f"登録事業所数: {count}件")
     
     # サンプルデータを表示
-    companies = db_manager.get_all_companies(limit=5)
+    companies = list(db_manager.get_all_companies(limit=5))
     if companies:
         logger.info("\nサンプルデータ（最新5件）:")
         for company in companies:
@@ -153,7 +177,7 @@ def main():
         
         elif command == 'report':
             # サマリーレポート出力
-            db_manager = DatabaseManager()
+            db_manager = get_db_manager()
             exporter = DataExporter(db_manager)
             filepath = exporter.export_summary_report()
             if filepath:
@@ -173,10 +197,10 @@ def print_usage():
   python main.py <command> [options]
 
 コマンド:
-  scrape [url1,url2,...]  データを取得してデータベースに保存
-  export [csv|excel]      データをエクスポート
-  stats                   データベースの統計情報を表示
-  report                  サマリーレポートを出力
+  scrape [url1,url2,...]      データを取得してデータベースに保存
+  export [csv|excel|parquet]  データをエクスポート
+  stats                       データベースの統計情報を表示
+  report                      サマリーレポートを出力
 
 例:
   python main.py scrape https://example.com/companies
@@ -2,114 +2,471 @@
 データ取得モジュール
 Webから通販事業所データを取得する
 """
+import asyncio
 import logging
+import re
+import threading
 import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+import httpx
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Optional
+import requests_cache
+import lxml.html
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
+from typing import Callable, List, Dict, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
 import config
+import utils
+
+try:
+    # hishelはPython 3.10以上が必要なため、導入されていない場合はキャッシュなしで取得する
+    import hishel
+    from hishel.httpx import AsyncCacheTransport
+except ImportError:
+    hishel = None
 
 logger = logging.getLogger(__name__)
 
+# scrape_multiple_urls_asyncでHTML解析にプロセスプールを使用するURL数の閾値
+PARALLEL_PARSE_THRESHOLD = 8
+
+# requests.Sessionの接続プール設定
+POOL_CONNECTIONS = 32  # 接続プールを保持するホスト数
+POOL_MAXSIZE = 64  # ホストごとに保持する接続数
+# リトライ対象とするHTTPステータス
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+# Content-Typeヘッダーおよび<meta>タグの文字コード指定
+_HEADER_CHARSET_RE = re.compile(r'charset=["\']?([\w-]+)', re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+# Shift_JISはWindows拡張文字を含むcp932として扱う
+_CHARSET_ALIASES = {
+    'shift_jis': 'cp932',
+    'shift-jis': 'cp932',
+    'sjis': 'cp932',
+    'x-sjis': 'cp932',
+    'windows-31j': 'cp932',
+}
+
+# httpx（非同期取得）のキャッシュファイル
+# （hishelは保存先のディレクトリに全ファイルを除外する.gitignoreを作成するため、専用のディレクトリに置く）
+ASYNC_HTTP_CACHE_PATH = Path(config.HTTP_CACHE_PATH).parent / 'httpx_cache' / 'http_cache.sqlite'
+
+
+def decode_html(content: bytes, content_type: Optional[str] = None) -> str:
+    """
+    レスポンス本文を文字列にデコード
+    
+    LexborHTMLParserはバイト列を常にUTF-8として解釈するため、
+    Content-Typeヘッダー、<meta>タグの順で文字コードを判定してからデコードする。
+    
+    Args:
+        content: レスポンス本文
+        content_type: Content-Typeヘッダーの値
+        
+    Returns:
+        デコードしたHTML文字列
+    """
+    match = _HEADER_CHARSET_RE.search(content_type) if content_type else None
+    if match:
+        encoding = match.group(1)
+    else:
+        match = _META_CHARSET_RE.search(content, 0, 2048)
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    encoding = _CHARSET_ALIASES.get(encoding.lower(), encoding)
+    
+    try:
+        return content.decode(encoding, errors='replace')
+    except LookupError:
+        return content.decode('utf-8', errors='replace')
+
+
+@dataclass
+class CompanyRow:
+    """HTMLから抽出した事業所データ1件（行ごとの辞書の代わりに固定スロットで保持）"""
+    __slots__ = ('company_name', 'address', 'phone_number', 'website_url', 'source_url')
+    company_name: str
+    address: Optional[str]
+    phone_number: Optional[str]
+    website_url: Optional[str]
+    source_url: str
+
+
+def _resolve_href(source_url: str, href: str) -> str:
+    """リンク先を絶対URLに変換（既に絶対URLの場合はurljoinを省略）"""
+    if href.startswith(('http://', 'https://')):
+        return href
+    return urljoin(source_url, href)
+
+
+def parse_html(html: str) -> Union[LexborHTMLParser, lxml.html.HtmlElement]:
+    """
+    HTMLを解析する
+    
+    通常はLexborHTMLParserを使い、body要素を構築できない壊れたHTMLのみ
+    lxml.htmlで解析する。
+    
+    Args:
+        html: HTML文字列
+        
+    Returns:
+        LexborHTMLParserオブジェクト（フォールバック時はlxmlのルート要素）
+    """
+    tree = LexborHTMLParser(html)
+    if tree.body is None:
+        logger.debug("body要素が見つからないため、lxmlで解析します")
+        try:
+            return lxml.html.document_fromstring(html)
+        except (etree.ParserError, ValueError) as e:
+            logger.debug(f"lxmlでの解析に失敗しました: {e}")
+    return tree
+
+
+def extract_company_rows(
+    tree: Union[LexborHTMLParser, lxml.html.HtmlElement],
+    source_url: str
+) -> List[CompanyRow]:
+    """
+    HTMLから事業所データを抽出（汎用関数）
+    
+    注意: この関数は汎用的な実装です。
+    実際のデータソースに応じて、同じ引数・戻り値の抽出関数を実装し、
+    WebScraper(extractor=...)に指定してください。
+    抽出関数はプロセスプールで実行されることがあるため、pickle可能である必要があります
+    （モジュールレベルの関数、またはそれをfunctools.partialで包んだもの）。
+    
+    Args:
+        tree: LexborHTMLParserオブジェクト（またはlxmlのルート要素）
+        source_url: データ取得元URL
+        
+    Returns:
+        抽出した事業所データ（CompanyRow）のリスト
+    """
+    if isinstance(tree, lxml.html.HtmlElement):
+        return _extract_company_rows_lxml(tree, source_url)
+    
+    companies = []
+    
+    # ここに実際のデータ抽出ロジックを実装
+    # 例: テーブルからデータを抽出
+    for table in tree.css('table'):
+        for row in table.css('tr')[1:]:  # ヘッダー行をスキップ
+            cells = row.css('td, th')
+            if len(cells) < 2:
+                continue
+            
+            company_name = cells[0].text(deep=True, strip=True)
+            if not company_name:
+                continue
+            
+            # リンクからURLを取得
+            link = row.css_first('a[href]')
+            companies.append(CompanyRow(
+                company_name=company_name,
+                address=cells[1].text(deep=True, strip=True),
+                phone_number=cells[2].text(deep=True, strip=True) if len(cells) > 2 else None,
+                website_url=_resolve_href(source_url, link.attributes.get('href') or '') if link is not None else None,
+                source_url=source_url
+            ))
+    
+    logger.info(f"{len(companies)}件のデータを抽出しました")
+    return companies
+
+
+def _extract_company_rows_lxml(root: lxml.html.HtmlElement, source_url: str) -> List[CompanyRow]:
+    """lxmlで解析したHTMLから事業所データを抽出（フォールバック用）"""
+    companies = []
+    
+    for table in root.iterfind('.//table'):
+        rows = table.iterfind('.//tr')
+        next(rows, None)  # ヘッダー行をスキップ
+        for row in rows:
+            cells = row.xpath('.//td | .//th')
+            if len(cells) < 2:
+                continue
+            
+            company_name = _lxml_text(cells[0])
+            if not company_name:
+                continue
+            
+            # リンクからURLを取得
+            link = row.find('.//a[@href]')
+            companies.append(CompanyRow(
+                company_name=company_name,
+                address=_lxml_text(cells[1]),
+                phone_number=_lxml_text(cells[2]) if len(cells) > 2 else None,
+                website_url=_resolve_href(source_url, link.get('href')) if link is not None else None,
+                source_url=source_url
+            ))
+    
+    logger.info(f"{len(companies)}件のデータを抽出しました")
+    return companies
+
+
+def _lxml_text(element: lxml.html.HtmlElement) -> str:
+    """要素内のテキストを連結（LexborHTMLParserのtext(deep=True, strip=True)と同じ規則）"""
+    return ''.join(text.strip() for text in element.itertext())
+
+
+class _PoliteHTTPAdapter(HTTPAdapter):
+    """
+    実際に通信する直前に同一ホストへのリクエスト間隔を空けるHTTPAdapter
+    
+    requests-cacheのセッションに設定するため、キャッシュから返すリクエストでは待機しない。
+    """
+    
+    def __init__(self, reserve_slot: Callable[[str], float], **kwargs):
+        """
+        初期化
+        
+        Args:
+            reserve_slot: URLを受け取り待機秒数を返す関数（WebScraper._reserve_request_slot）
+            **kwargs: HTTPAdapterの引数
+        """
+        self._reserve_slot = reserve_slot
+        super().__init__(**kwargs)
+    
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """リクエスト間隔を空けてから送信"""
+        wait = self._reserve_slot(request.url)
+        if wait > 0:
+            time.sleep(wait)
+        return super().send(request, **kwargs)
+
+
+class _PoliteAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    実際に通信する直前に同一ホストへのリクエスト間隔と同時リクエスト数を制限するトランスポート
+    
+    hishelのキャッシュの下位に置くため、キャッシュから返すリクエストでは待機しない。
+    また、requests-cacheのexpire_afterと同じく、Cache-ControlとExpiresのない
+    正常応答にはconfig.HTTP_CACHE_EXPIRE秒の有効期限を付与する。
+    """
+    
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        reserve_slot: Callable[[str], float],
+        semaphore: asyncio.Semaphore
+    ):
+        """
+        初期化
+        
+        Args:
+            transport: 実際に通信するトランスポート
+            reserve_slot: URLを受け取り待機秒数を返す関数（WebScraper._reserve_request_slot）
+            semaphore: 同時リクエスト数を制限するセマフォ
+        """
+        self._transport = transport
+        self._reserve_slot = reserve_slot
+        self._semaphore = semaphore
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """リクエスト間隔を空けて送信し、本文まで受信したレスポンスを返す"""
+        # 待機中は同時実行枠を占有しない
+        wait = self._reserve_slot(str(request.url))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        
+        async with self._semaphore:
+            response = await self._transport.handle_async_request(request)
+            try:
+                body = b''.join([chunk async for chunk in response.stream])
+            finally:
+                await response.aclose()
+        
+        headers = response.headers
+        if response.status_code == 200 and 'Cache-Control' not in headers and 'Expires' not in headers:
+            headers['Cache-Control'] = f'max-age={config.HTTP_CACHE_EXPIRE}'
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            stream=httpx.ByteStream(body),
+            extensions=response.extensions
+        )
+    
+    async def aclose(self):
+        """下位のトランスポートを閉じる"""
+        await self._transport.aclose()
+
+
+def _build_async_transport(
+    reserve_slot: Callable[[str], float],
+    semaphore: asyncio.Semaphore
+) -> httpx.AsyncBaseTransport:
+    """
+    scrape_multiple_urls_asyncで使用するhttpxのトランスポートを生成
+    
+    hishelが利用できる場合は、requests-cacheのセッションと同じくCache-Controlに従い
+    取得したページをSQLiteにキャッシュするトランスポートで包む。
+    
+    Args:
+        reserve_slot: URLを受け取り待機秒数を返す関数（WebScraper._reserve_request_slot）
+        semaphore: 同時リクエスト数を制限するセマフォ
+        
+    Returns:
+        httpxのトランスポート
+    """
+    # HTTP/2（HTTPSのみ）で同一ホストへのリクエストを1本の接続に多重化する
+    transport = _PoliteAsyncTransport(
+        httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=POOL_MAXSIZE, max_keepalive_connections=POOL_CONNECTIONS)
+        ),
+        reserve_slot,
+        semaphore
+    )
+    if hishel is None:
+        return transport
+    
+    ASYNC_HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    return AsyncCacheTransport(
+        next_transport=transport,
+        storage=hishel.AsyncSqliteStorage(database_path=ASYNC_HTTP_CACHE_PATH),
+        # requests-cacheと同じく利用者専用のキャッシュとして扱う
+        policy=hishel.SpecificationPolicy(
+            cache_options=hishel.CacheOptions(shared=False, supported_methods=['GET'])
+        )
+    )
+
+
+def _parse_html_to_rows(extractor: Callable, html: str, source_url: str) -> List[CompanyRow]:
+    """HTMLを解析して事業所データを抽出（プロセスプールのワーカーでも実行するモジュール関数）"""
+    return extractor(parse_html(html), source_url)
+
 
 class WebScraper:
     """Webスクレイパークラス"""
     
-    def __init__(self):
-        """初期化"""
-        self.session = requests.Session()
+    def __init__(self, extractor: Callable = extract_company_rows):
+        """
+        初期化
+        
+        Args:
+            extractor: 解析済みHTMLと取得元URLからCompanyRowのリストを返す抽出関数
+                       （プロセスプールで実行されるため、pickle可能である必要がある）
+        """
+        self.extractor = extractor
+        
+        # 取得したページはSQLiteにキャッシュし、再実行時の再取得を省く
+        # （Cache-Controlを尊重し、期限切れ後はETag/Last-Modifiedで再検証する）
+        self.session = requests_cache.CachedSession(
+            config.HTTP_CACHE_PATH,
+            backend='sqlite',
+            expire_after=config.HTTP_CACHE_EXPIRE,
+            cache_control=True,
+            allowable_methods=('GET',)
+        )
+        # Accept-Encodingはrequestsの既定値（gzip, deflate。brotliがあればbrも）を使い、
+        # 圧縮されたレスポンスはurllib3がC実装で展開する
         self.session.headers.update({
             'User-Agent': config.USER_AGENT
         })
+        
+        # ホストごとの次回リクエスト可能時刻（time.monotonic基準）
+        self._next_request_per_host: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # (スキーム, ホスト)ごとの解析済みrobots.txt
+        self._robots: Dict[Tuple[str, str], RobotFileParser] = {}
+        
+        # 接続を再利用し、リトライと指数バックオフはurllib3に任せる
+        # （同一ホストへのリクエスト間隔はキャッシュにない場合のみアダプターで空ける）
+        adapter = _PoliteHTTPAdapter(
+            self._reserve_request_slot,
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=Retry(
+                total=config.MAX_RETRIES,
+                backoff_factor=1,
+                status_forcelist=RETRY_STATUS_CODES,
+                allowed_methods=['GET']
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
-    def fetch_page(self, url: str, retries: int = None) -> Optional[BeautifulSoup]:
+    def _reserve_request_slot(self, url: str) -> float:
         """
-        Webページを取得してBeautifulSoupオブジェクトを返す
+        ホストごとのリクエスト枠を予約し、待機すべき秒数を返す
+        
+        同一ホストへのリクエストはconfig.REQUEST_DELAYの間隔を空ける。
+        待機時間は前回のリクエストからの経過時間を差し引いたもので、
+        その間に解析など他の処理が進んでいれば待機は不要になる。
         
         Args:
-            url: 取得するURL
-            retries: リトライ回数（デフォルト: config.MAX_RETRIES）
+            url: リクエスト先URL
             
         Returns:
-            BeautifulSoupオブジェクト、失敗時はNone
+            待機秒数
         """
-        if retries is None:
-            retries = config.MAX_RETRIES
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_per_host.get(host, now))
+            self._next_request_per_host[host] = start + config.REQUEST_DELAY
+        return start - now
+    
+    def fetch_page(self, url: str) -> Optional[Union[LexborHTMLParser, lxml.html.HtmlElement]]:
+        """
+        Webページを取得して解析済みのHTMLツリーを返す
         
-        for attempt in range(retries + 1):
-            try:
-                logger.info(f"ページを取得中: {url} (試行 {attempt + 1}/{retries + 1})")
-                
-                response = self.session.get(
-                    url,
-                    timeout=config.REQUEST_TIMEOUT
-                )
-                response.raise_for_status()
-                
-                # リクエスト間隔を空ける
-                time.sleep(config.REQUEST_DELAY)
-                
-                soup = BeautifulSoup(response.content, 'lxml')
-                logger.info(f"ページの取得に成功しました: {url}")
-                return soup
-                
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"ページ取得エラー (試行 {attempt + 1}/{retries + 1}): {e}")
-                if attempt < retries:
-                    time.sleep(2 ** attempt)  # 指数バックオフ
-                else:
-                    logger.error(f"ページの取得に失敗しました: {url}")
-                    return None
+        リトライ（最大config.MAX_RETRIES回）と同一ホストへのリクエスト間隔の調整は
+        セッションに設定したHTTPAdapterで行う（キャッシュから取得する場合は待機しない）。
         
-        return None
+        Args:
+            url: 取得するURL
+            
+        Returns:
+            LexborHTMLParserオブジェクト（parse_html参照）、失敗時はNone
+        """
+        try:
+            logger.info(f"ページを取得中: {url}")
+            
+            response = self.session.get(
+                url,
+                timeout=config.REQUEST_TIMEOUT
+            )
+            response.raise_for_status()
+            if getattr(response, 'from_cache', False):
+                logger.debug(f"キャッシュから取得しました: {url}")
+            
+            tree = parse_html(decode_html(response.content, response.headers.get('Content-Type')))
+            logger.info(f"ページの取得に成功しました: {url}")
+            return tree
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"ページの取得に失敗しました: {url} ({e})")
+            return None
     
-    def extract_company_data(self, soup: BeautifulSoup, source_url: str) -> List[Dict[str, Any]]:
+    def extract_company_data(
+        self,
+        tree: Union[LexborHTMLParser, lxml.html.HtmlElement],
+        source_url: str
+    ) -> List[CompanyRow]:
         """
-        HTMLから事業所データを抽出（汎用メソッド）
+        HTMLから事業所データを抽出
         
-        注意: このメソッドは汎用的な実装です。
-        実際のデータソースに応じて、このメソッドをオーバーライドするか、
-        専用の抽出メソッドを実装してください。
+        抽出処理は初期化時に指定したextractor（既定はextract_company_rows）で行う。
+        データソースに応じて、extractorを指定するか、このメソッドをオーバーライドしてください。
+        オーバーライドした場合、scrape_multiple_urls_asyncの解析はプロセスプールを使わず
+        スレッドプールで行う（インスタンスのメソッドはワーカープロセスに渡せないため）。
         
         Args:
-            soup: BeautifulSoupオブジェクト
+            tree: LexborHTMLParserオブジェクト（またはlxmlのルート要素）
             source_url: データ取得元URL
             
         Returns:
-            抽出した事業所データのリスト
-        """
-        companies = []
-        
-        # ここに実際のデータ抽出ロジックを実装
-        # 例: テーブルからデータを抽出
-        tables = soup.find_all('table')
-        
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows[1:]:  # ヘッダー行をスキップ
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    company_data = {
-                        'company_name': cells[0].get_text(strip=True) if len(cells) > 0 else None,
-                        'address': cells[1].get_text(strip=True) if len(cells) > 1 else None,
-                        'phone_number': cells[2].get_text(strip=True) if len(cells) > 2 else None,
-                        'website_url': None,
-                        'source_url': source_url
-                    }
-                    
-                    # リンクからURLを取得
-                    link = row.find('a', href=True)
-                    if link:
-                        company_data['website_url'] = urljoin(source_url, link['href'])
-                    
-                    if company_data['company_name']:
-                        companies.append(company_data)
-        
-        logger.info(f"{len(companies)}件のデータを抽出しました")
-        return companies
+            抽出した事業所データ（CompanyRow）のリスト
+        """
+        return self.extractor(tree, source_url)
     
-    def scrape_companies(self, url: str) -> List[Dict[str, Any]]:
+    def scrape_companies(self, url: str) -> List[CompanyRow]:
         """
         指定されたURLから事業所データを取得
         
@@ -117,62 +474,204 @@ class WebScraper:
             url: データ取得元URL
             
         Returns:
-            取得した事業所データのリスト
+            取得した事業所データ（CompanyRow）のリスト
         """
-        soup = self.fetch_page(url)
-        if not soup:
+        tree = self.fetch_page(url)
+        if tree is None:
             return []
         
-        companies = self.extract_company_data(soup, url)
+        companies = self.extract_company_data(tree, url)
         return companies
     
-    def scrape_multiple_urls(self, urls: List[str]) -> List[Dict[str, Any]]:
+    def scrape_multiple_urls(self, urls: List[str]) -> List[CompanyRow]:
         """
         複数のURLから事業所データを取得
         
+        内部ではscrape_multiple_urls_asyncで並行に取得する。
+        
         Args:
             urls: データ取得元URLのリスト
             
         Returns:
-            取得した事業所データのリスト
+            取得した事業所データ（CompanyRow）のリスト
         """
-        all_companies = []
+        return asyncio.run(self.scrape_multiple_urls_async(urls))
+    
+    async def fetch_page_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        retries: int = None
+    ) -> Optional[str]:
+        """
+        Webページを非同期で取得してデコード済みのHTMLを返す
+        
+        fetch_pageと同じく、通信エラーとRETRY_STATUS_CODESのステータスのみリトライする
+        （404などその他のエラーは再送しない）。
+        
+        Args:
+            client: httpxのAsyncClient
+            url: 取得するURL
+            retries: リトライ回数（デフォルト: config.MAX_RETRIES）
+            
+        Returns:
+            HTML文字列、失敗時はNone
+        """
+        if retries is None:
+            retries = config.MAX_RETRIES
         
-        for url in urls:
+        for attempt in range(retries + 1):
+            try:
+                logger.info(f"ページを取得中: {url} (試行 {attempt + 1}/{retries + 1})")
+                response = await client.get(url)
+                response.raise_for_status()
+                if response.extensions.get('hishel_from_cache'):
+                    logger.debug(f"キャッシュから取得しました: {url}")
+                logger.info(f"ページの取得に成功しました: {url}")
+                return decode_html(response.content, response.headers.get('Content-Type'))
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRY_STATUS_CODES:
+                    logger.error(f"ページの取得に失敗しました: {url} ({e.response.status_code})")
+                    return None
+                error = e
+            except httpx.TransportError as e:
+                error = e
+            except httpx.HTTPError as e:
+                logger.error(f"ページの取得に失敗しました: {url} ({e})")
+                return None
+            
+            logger.warning(f"ページ取得エラー (試行 {attempt + 1}/{retries + 1}): {error}")
+            if attempt < retries:
+                await asyncio.sleep(2 ** attempt)  # 指数バックオフ
+            else:
+                logger.error(f"ページの取得に失敗しました: {url}")
+        
+        return None
+    
+    async def scrape_multiple_urls_async(self, urls: List[str]) -> List[CompanyRow]:
+        """
+        複数のURLから事業所データを並行して取得
+        
+        同時リクエスト数はconfig.MAX_CONCURRENCYまでに制限し、
+        同一ホストへのリクエストはconfig.REQUEST_DELAYの間隔を空ける。
+        HTML解析はCPU処理のため、イベントループの外で実行する。
+        URL数がPARALLEL_PARSE_THRESHOLDを超える場合は、GILの影響を受けないよう
+        プロセスプールで複数ページを並列に解析する（extract_company_dataを
+        オーバーライドしている場合を除く）。
+        
+        Args:
+            urls: データ取得元URLのリスト
+            
+        Returns:
+            取得した事業所データ（CompanyRow）のリスト
+        """
+        # extract_company_dataがオーバーライドされている場合は、同じ抽出結果になるよう
+        # スレッドプールでそのメソッドを呼び出す
+        overridden = type(self).extract_company_data is not WebScraper.extract_company_data
+        if len(urls) > PARALLEL_PARSE_THRESHOLD and not overridden:
+            with utils.worker_process_pool() as executor:
+                return await self._scrape_urls(urls, executor)
+        return await self._scrape_urls(urls, None)
+    
+    async def _scrape_urls(self, urls: List[str], executor: Optional[Executor]) -> List[CompanyRow]:
+        """
+        複数のURLから事業所データを並行して取得（scrape_multiple_urls_asyncの本体）
+        
+        Args:
+            urls: データ取得元URLのリスト
+            executor: HTML解析に使用するプロセスプール
+                      （Noneの場合は既定のスレッドプールでextract_company_dataを呼び出す）
+            
+        Returns:
+            取得した事業所データ（CompanyRow）のリスト
+        """
+        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY)
+        loop = asyncio.get_running_loop()
+        
+        async def scrape(client: httpx.AsyncClient, url: str) -> List[CompanyRow]:
             logger.info(f"URLからデータを取得中: {url}")
-            companies = self.scrape_companies(url)
-            all_companies.extend(companies)
-            time.sleep(config.REQUEST_DELAY)
+            html = await self.fetch_page_async(client, url)
+            
+            if html is None:
+                return []
+            if executor is None:
+                return await loop.run_in_executor(None, self._parse_and_extract, html, url)
+            return await loop.run_in_executor(executor, _parse_html_to_rows, self.extractor, html, url)
+        
+        async with httpx.AsyncClient(
+            # リクエスト間隔と同時リクエスト数の制限は、キャッシュにない場合のみトランスポートで行う
+            transport=_build_async_transport(self._reserve_request_slot, semaphore),
+            headers={'User-Agent': config.USER_AGENT},
+            timeout=config.REQUEST_TIMEOUT,
+            follow_redirects=True
+        ) as client:
+            results = await asyncio.gather(*(scrape(client, url) for url in urls), return_exceptions=True)
+        
+        all_companies = []
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.error(f"データの取得に失敗しました: {url} ({result})")
+                continue
+            all_companies.extend(result)
         
         logger.info(f"合計 {len(all_companies)}件のデータを取得しました")
         return all_companies
     
-    def check_robots_txt(self, base_url: str) -> bool:
+    def _parse_and_extract(self, html: str, source_url: str) -> List[CompanyRow]:
+        """HTMLを解析して事業所データを抽出（スレッドプールで実行）"""
+        return self.extract_company_data(parse_html(html), source_url)
+    
+    def check_robots_txt(self, url: str) -> bool:
         """
-        robots.txtをチェック（簡易版）
+        robots.txtでURLの取得が許可されているかをチェック
         
-        注意: 本格的な実装にはrobots.txtパーサーライブラリの使用を推奨
+        robots.txtはホストごとに一度だけ取得し、解析結果を再利用する。
         
         Args:
-            base_url: ベースURL
+            url: 取得予定のURL
             
         Returns:
             スクレイピングが許可されている場合はTrue
         """
-        try:
-            parsed = urlparse(base_url)
-            robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.netloc)
+        
+        robots = self._robots.get(key)
+        if robots is None:
+            robots = self._robots[key] = self._load_robots_txt(*key)
+        
+        allowed = robots.can_fetch(config.USER_AGENT, url)
+        if not allowed:
+            logger.warning(f"robots.txtでスクレイピングが禁止されています: {url}")
+        return allowed
+    
+    def _load_robots_txt(self, scheme: str, netloc: str) -> RobotFileParser:
+        """
+        robots.txtを取得して解析
+        
+        Args:
+            scheme: URLスキーム
+            netloc: ホスト名（ポートを含む）
             
+        Returns:
+            解析済みのRobotFileParser
+        """
+        robots_url = f"{scheme}://{netloc}/robots.txt"
+        robots = RobotFileParser(robots_url)
+        
+        try:
             response = self.session.get(robots_url, timeout=10)
-            if response.status_code == 200:
-                robots_content = response.text.lower()
-                # 簡易チェック（実際の実装ではより詳細な解析が必要）
-                if 'disallow: /' in robots_content:
-                    logger.warning(f"robots.txtでスクレイピングが制限されている可能性があります: {base_url}")
-                    return False
-            
-            return True
-        except Exception as e:
+        except requests.exceptions.RequestException as e:
             logger.warning(f"robots.txtのチェックに失敗しました: {e}")
-            return True  # エラー時は許可とみなす（注意が必要）
+            robots.allow_all = True  # エラー時は許可とみなす（注意が必要）
+            return robots
+        
+        # RobotFileParser.readと同じく、401/403は全て禁止、その他のエラーは全て許可とみなす
+        if response.status_code in (401, 403):
+            robots.disallow_all = True
+        elif response.status_code >= 400:
+            robots.allow_all = True
+        else:
+            robots.parse(response.text.splitlines())
+        return robots
 
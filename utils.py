@@ -4,11 +4,62 @@
 """
 import re
 import logging
-from typing import Optional
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterator, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# 正規表現はモジュール読み込み時に一度だけコンパイル
+# （data_processorの一括整形でも同じパターンを使用する。照合はfullmatchで行う）
+PHONE_STRIP_RE = re.compile(r'[^\d\-]')
+PHONE_FORMAT_RE = re.compile(r'\d{2,4}-\d{1,4}-\d{4}')
+NON_DIGIT_RE = re.compile(r'\D')
+WHITESPACE_RE = re.compile(r'\s+')
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+
+class _KeepCharsTable(dict):
+    """
+    str.translate用の変換表（数字と指定文字のみ残す）
+    
+    数字の判定は正規表現の\dと同じくstr.isdecimalで行い、
+    初めて出現した文字の判定結果をその場でキャッシュする。
+    """
+    
+    def __init__(self, keep: str = ''):
+        """初期化"""
+        super().__init__()
+        self._keep = frozenset(keep)
+    
+    def __missing__(self, code: int) -> Optional[int]:
+        """未登録の文字を判定して登録"""
+        char = chr(code)
+        value = code if char.isdecimal() or char in self._keep else None
+        self[code] = value
+        return value
+
+
+# 数字とハイフンのみ残す変換表（電話番号用）
+_PHONE_CHARS = _KeepCharsTable('-')
+# 数字のみ残す変換表
+_DIGITS = _KeepCharsTable()
+
+# parse_dateで年月日を直接取り出す形式（区切り文字は統一されている必要がある）
+# （data_processorの一括整形でも同じパターンを使用する。照合はfullmatchで行う）
+DATE_RE = re.compile(r'(\d{4})([-/.])([0-9]{1,2})\2([0-9]{1,2})')
+JP_DATE_RE = re.compile(r'(\d{4})年([0-9]{1,2})月([0-9]{1,2})日')
+
+# parse_dateで上記に一致しない場合に試行する日付形式（順に試行）
+_DATE_FORMATS = (
+    '%Y-%m-%d',
+    '%Y/%m/%d',
+    '%Y年%m月%d日',
+    '%Y.%m.%d',
+)
 
 def normalize_phone_number(phone: Optional[str]) -> Optional[str]:
     """
@@ -23,16 +74,22 @@ def normalize_phone_number(phone: Optional[str]) -> Optional[str]:
     if not phone:
         return None
     
-    # 数字とハイフン以外を除去
-    phone = re.sub(r'[^\d\-]', '', phone)
-    
-    # 既に適切な形式の場合はそのまま返す
-    if re.match(r'^\d{2,4}-\d{1,4}-\d{4}$', phone):
-        return phone
+    if phone.isdecimal():
+        # 数字のみの場合は文字の除去と形式チェックを省略
+        digits_only = phone
+    else:
+        # 数字とハイフン以外を除去
+        phone = phone.translate(_PHONE_CHARS)
+        
+        # 既に適切な形式の場合はそのまま返す（市外局番の桁数を保持するため）
+        if '-' in phone:
+            if PHONE_FORMAT_RE.fullmatch(phone):
+                return phone
+            digits_only = phone.replace('-', '')
+        else:
+            digits_only = phone
     
     # 数字のみの場合、適切な位置にハイフンを挿入
-    digits_only = re.sub(r'[^\d]', '', phone)
-    
     if len(digits_only) == 10:
         # 固定電話（10桁）
         return f"{digits_only[:2]}-{digits_only[2:6]}-{digits_only[6:]}"
@@ -57,8 +114,8 @@ def normalize_postal_code(postal_code: Optional[str]) -> Optional[str]:
     if not postal_code:
         return None
     
-    # 数字とハイフン以外を除去
-    digits = re.sub(r'[^\d]', '', postal_code)
+    # 数字以外を除去
+    digits = postal_code.translate(_DIGITS)
     
     if len(digits) == 7:
         return f"{digits[:3]}-{digits[3:]}"
@@ -83,12 +140,15 @@ def normalize_url(url: Optional[str]) -> Optional[str]:
         return None
     
     url = url.strip()
+    if not url:
+        return None
     
-    # プロトコルがない場合は追加
-    if url and not url.startswith(('http://', 'https://')):
-        url = f'https://{url}'
+    # プロトコルがある場合はそのまま返す（大文字のスキームも許容）
+    if url.startswith(('http://', 'https://')) or url[:8].lower().startswith(('http://', 'https://')):
+        return url
     
-    return url
+    # プロトコルがない場合は追加
+    return 'https://' + url
 
 
 def clean_text(text: Optional[str]) -> Optional[str]:
@@ -104,16 +164,8 @@ def clean_text(text: Optional[str]) -> Optional[str]:
     if not text:
         return None
     
-    # 前後の空白を除去
-    text = text.strip()
-    
-    # 連続する空白を1つに
-    text = re.sub(r'\s+', ' ', text)
-    
-    # 改行を空白に変換
-    text = text.replace('\n', ' ').replace('\r', ' ')
-    
-    return text if text else None
+    # 連続する空白（改行を含む）を1つにまとめ、前後の空白を除去
+    return WHITESPACE_RE.sub(' ', text).strip() or None
 
 
 def validate_email(email: Optional[str]) -> bool:
@@ -129,8 +181,7 @@ def validate_email(email: Optional[str]) -> bool:
     if not email:
         return False
     
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return EMAIL_RE.fullmatch(email) is not None
 
 
 def parse_date(date_str: Optional[str]) -> Optional[datetime]:
@@ -146,20 +197,36 @@ def parse_date(date_str: Optional[str]) -> Optional[datetime]:
     if not date_str:
         return None
     
-    date_formats = [
-        '%Y-%m-%d',
-        '%Y/%m/%d',
-        '%Y年%m月%d日',
-        '%Y.%m.%d',
-    ]
+    date_str = date_str.strip()
+    
+    # ISO形式（YYYY-MM-DD）はfromisoformatで解析
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
+    
+    match = DATE_RE.fullmatch(date_str)
+    if match:
+        year, month, day = match.group(1, 3, 4)
+    else:
+        match = JP_DATE_RE.fullmatch(date_str)
+        if match:
+            year, month, day = match.groups()
     
-    for fmt in date_formats:
+    if match:
         try:
-            return datetime.strptime(date_str.strip(), fmt)
+            return datetime(int(year), int(month), int(day))
         except ValueError:
-            continue
+            pass
+    else:
+        for fmt in _DATE_FORMATS:
+            try:
+                return datetime.strptime(date_str, fmt)
+            except ValueError:
+                continue
     
-    logger.warning(f"日付の解析に失敗しました: {date_str}")
+    logger.debug(f"日付の解析に失敗しました: {date_str}")
     return None
 
 
@@ -176,14 +243,61 @@ def extract_numbers(text: Optional[str]) -> Optional[int]:
     if not text:
         return None
     
-    # 数字を抽出
-    numbers = re.findall(r'\d+', text.replace(',', ''))
+    # 数字のみを抽出（カンマ等の区切り文字も除去される）
+    digits = text.translate(_DIGITS)
     
-    if numbers:
+    if digits:
         try:
-            return int(''.join(numbers))
+            return int(digits)
         except ValueError:
             return None
     
     return None
 
+
+class _LogForwarder(logging.Handler):
+    """ワーカープロセスから受け取ったログを親プロセスの同名ロガーで処理する"""
+    
+    def emit(self, record: logging.LogRecord):
+        """ログレコードを親プロセスのロガーに渡す"""
+        target = logging.getLogger(record.name)
+        if target.isEnabledFor(record.levelno):
+            target.handle(record)
+
+
+def _init_worker_logging(log_queue: multiprocessing.Queue, level: int):
+    """ワーカープロセスのログ出力先を親プロセスへのキューに差し替える"""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+
+@contextmanager
+def worker_process_pool(max_workers: Optional[int] = None) -> Iterator[ProcessPoolExecutor]:
+    """
+    ログを親プロセスに転送するプロセスプールを生成
+    
+    ワーカーのログはmultiprocessingのキュー経由で親プロセスに送られ、
+    親プロセスのロガー（main.setup_loggingのハンドラーなど）で出力される。
+    
+    Args:
+        max_workers: ワーカープロセス数（Noneの場合はCPU数）
+        
+    Yields:
+        ProcessPoolExecutor
+    """
+    log_queue = multiprocessing.Queue(-1)
+    listener = QueueListener(log_queue, _LogForwarder())
+    listener.start()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker_logging,
+            initargs=(log_queue, logging.getLogger().getEffectiveLevel())
+        ) as executor:
+            yield executor
+    finally:
+        listener.stop()
+        log_queue.close()